@@ -1,15 +1,209 @@
 import math
+import os
 import random
+import threading
+import numpy as np
 from qiskit import QuantumCircuit, transpile
+from qiskit.circuit.library import MCXGate, DiagonalGate
+from qiskit.synthesis import synth_mcx_n_dirty_i15
 from qiskit_aer import AerSimulator
-from sympy import symbols, Not, Or, And, to_cnf
+from sympy import symbols, Not, Or, And, to_cnf, lambdify, true, false
 from sympy.parsing.sympy_parser import parse_expr
 import re
 
+try:
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional - the NumPy path is used instead
+    HAVE_NUMBA = False
+
+# matches variable names when parsing expressions - compiled once instead
+# of going through re's internal cache on every request
+_VAR_RE = re.compile(r"[a-zA-Z]+")
+
+# up to this many variables the oracle is emitted as one diagonal gate
+# built from the classical truth table, instead of the clause-by-clause
+# compute/phase-flip/uncompute cascade with its ancilla qubits
+DIAGONAL_MAX_VARS = 12
+
+# from this many controls on, the default MCX synthesis (quadratic CX count)
+# loses to the dirty-ancilla decomposition (linear CX count)
+MCX_DIRTY_MIN_CONTROLS = 5
+
+# block size for chunked truth-table sweeps - bounds peak memory to a few
+# MB regardless of the variable count
+SWEEP_CHUNK = 1 << 20
+
+# below this many variables the NumPy sweep is fast enough that JIT
+# compilation and thread startup are not worth it
+NUMBA_MIN_VARS = 18
+
+# solve_quantum submits its randomized schedule in waves of this many
+# circuits per Aer job - enough to amortize the fixed per-run dispatch
+# cost, while keeping the search able to stop between waves once an
+# attempt verifies instead of simulating the whole schedule
+SCHEDULE_WAVE = 4
+
+# up to this many variables get_histogram_data uses the direct statevector
+# kernel instead of dispatching through Aer, whose per-run Python/C overhead
+# dominates for small circuits
+DIRECT_SIM_MAX_VARS = 20
+
+if HAVE_NUMBA:
+
+    @njit(parallel=True, boundscheck=False, fastmath=True, cache=True)
+    def _eval_truth_table_jit(num_assignments, pos, neg):
+        """
+        Evaluates the CNF bitmask check for every assignment in parallel
+
+        Args:
+            num_assignments (int): 2**num_vars
+            pos: uint64 array of positive-literal masks, one per clause
+            neg: uint64 array of negative-literal masks, one per clause
+        Returns:
+            bool array: sat[a] is 1 iff assignment a satisfies all clauses
+        """
+        sat = np.empty(num_assignments, dtype=np.bool_)
+        for a in prange(num_assignments):
+            ua = np.uint64(a)
+            ok = 1
+            for c in range(pos.shape[0]):
+                if ((ua & pos[c]) | (~ua & neg[c])) == 0:
+                    ok = 0
+                    break
+            sat[a] = ok
+        return sat
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _grover_statevector_jit(sat, iterations):
+        """
+        Runs Grover iterations directly on a dense statevector
+
+        The amplitudes stay real throughout (uniform start, +/-1 oracle
+        phases, reflection about the mean), so the state is a float64 array
+
+        Args:
+            sat: bool array, True at satisfying assignment indices
+            iterations (int): number of Grover iterations
+        Returns:
+            float64 array: final amplitudes
+        """
+        N = sat.shape[0]
+        state = np.full(N, 1.0 / np.sqrt(N))
+        for _ in range(iterations):
+            # oracle: flip the phase of satisfying amplitudes
+            mean = 0.0
+            for i in prange(N):
+                if sat[i]:
+                    state[i] = -state[i]
+                mean += state[i]
+            # diffuser: reflect every amplitude about the mean
+            mean /= N
+            for i in prange(N):
+                state[i] = 2.0 * mean - state[i]
+        return state
+
+    # numba's parallel runtime is not safe to enter from two threads at
+    # once - under the default workqueue threading layer a concurrent
+    # launch aborts the whole process - and the kernels above run on the
+    # request thread pool. Entry is serialized here, and the first launch
+    # (which compiles the kernel and boots the thread layer) happens from
+    # the main thread via _warm_jit_kernels at solver construction
+    _JIT_LOCK = threading.Lock()
+
+    def _warm_jit_kernels():
+        """Compiles the kernels and boots the thread layer; call from the main thread"""
+        masks = np.ones(1, dtype=np.uint64)
+        _eval_truth_table_jit(2, masks, masks)
+        _grover_statevector_jit(np.zeros(2, dtype=np.bool_), 1)
+
+
+def _is_literal(e) -> bool:
+    """True if e is a variable or a negated variable"""
+    return bool(e.is_Symbol) or (isinstance(e, Not) and bool(e.args[0].is_Symbol))
+
+
+def _is_cnf(expr) -> bool:
+    """
+    True if the expression is already an AND of OR-clauses of literals
+
+    Args:
+        expr: sympy boolean expression
+    """
+    clauses = expr.args if isinstance(expr, And) else [expr]
+    for clause in clauses:
+        literals = clause.args if isinstance(clause, Or) else [clause]
+        if not all(_is_literal(lit) for lit in literals):
+            return False
+    return True
+
+
+class _BoundedCache(dict):
+    """
+    dict with a size cap - inserting past the cap evicts the oldest entry
+
+    Keeps the per-expression caches from growing without bound in a
+    long-running worker. Insertion order is a good enough recency proxy
+    here: hot expressions are re-inserted rarely but re-read often, and a
+    rebuild on a stale eviction only costs one extra miss
+
+    Inserts take a lock, since the caches are written from the request
+    thread pool and two threads evicting at capacity would otherwise race.
+    Reads stay lock-free (they are plain dict operations); note that
+    dict.setdefault bypasses __setitem__, so callers must use plain
+    assignment for the cap to apply
+    """
+
+    def __init__(self, maxsize):
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            if key not in self and len(self) >= self.maxsize:
+                del self[next(iter(self))]
+            super().__setitem__(key, value)
+
 
 class SatOracleBuilder:
     def __init__(self):
-        self.simulator = AerSimulator()
+        # single precision halves statevector memory traffic vs Aer's FP64
+        # default (plenty for sampling counts), and GPU execution is used
+        # when the installed Aer build supports it
+        device = "GPU" if "GPU" in AerSimulator().available_devices() else "CPU"
+        # Grover circuits are long chains of small gates - explicitly tuned
+        # fusion collapses them into fewer dense unitaries so the statevector
+        # is swept fewer times
+        self.simulator = AerSimulator(
+            method="statevector",
+            precision="single",
+            device=device,
+            fusion_enable=True,
+            fusion_threshold=5,
+            fusion_max_qubit=5,
+            # let Aer's OpenMP kernels use every core, run batched schedule
+            # experiments concurrently, and only go multi-threaded per
+            # statevector once circuits are big enough to be worth it
+            max_parallel_threads=os.cpu_count(),
+            max_parallel_experiments=os.cpu_count(),
+            statevector_parallel_threshold=14,
+        )
+        if HAVE_NUMBA:
+            # first kernel launch must come from the main thread - see
+            # _warm_jit_kernels
+            _warm_jit_kernels()
+        # per-expression caches - parsing and oracle construction are the
+        # dominant classical costs, and /solve hits both repeatedly for the
+        # same expression (classical check + quantum retries). All are
+        # size-capped; the circuit and histogram entries in particular are
+        # far too large to keep one per distinct expression ever seen
+        self._parse_cache = _BoundedCache(1024)
+        self._cnf_cache = _BoundedCache(1024)
+        self._oracle_cache = _BoundedCache(256)
+        self._transpiled_cache = _BoundedCache(256)
+        self._histogram_cache = _BoundedCache(256)
 
     def parse_expression(self, expression_string) -> tuple:
         """
@@ -20,8 +214,11 @@ class SatOracleBuilder:
         Returns:
             tuple: (sympy parsed expression, list of variables)
         """
+        if expression_string in self._parse_cache:
+            return self._parse_cache[expression_string]
+
         # extract all a-z, A-Z
-        variables = sorted(list(set(re.findall(r"[a-zA-Z]+", expression_string))))
+        variables = sorted(list(set(_VAR_RE.findall(expression_string))))
         if not variables:
             raise ValueError("no variables found in expression")
 
@@ -33,95 +230,494 @@ class SatOracleBuilder:
         except Exception as e:
             raise ValueError(f"failed to parse expression: {e}")
 
+        self._parse_cache[expression_string] = (expr, variables)
         return expr, variables
 
-    def solve_classically(self, expression_string) -> list:
+    def _cnf_of(self, expression_string) -> tuple:
         """
-        Classically solves the SAT problem by brute force
+        Returns the CNF form of the expression, converting it on first use
+
+        to_cnf with simplification can cost seconds for 6+ variables and is
+        needed by both the classical solver and the oracle builder, so the
+        result is cached per expression
 
         Args:
             expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
         Returns:
-            list: all satisfying assignments as binary strings
+            tuple: (sympy CNF expression, list of variables)
+        """
+        if expression_string not in self._cnf_cache:
+            expr, variables = self.parse_expression(expression_string)
+            if _is_cnf(expr):
+                # already an AND of OR-clauses (the common UI input) - to_cnf
+                # with simplification would build a full truth table just to
+                # hand back the same shape
+                cnf_expr = expr
+            else:
+                try:
+                    cnf_expr = to_cnf(expr, simplify=True)
+                except ValueError:
+                    # sympy refuses to simplify expressions with more than 8 variables
+                    cnf_expr = to_cnf(expr, simplify=False)
+            self._cnf_cache[expression_string] = (cnf_expr, variables)
+        return self._cnf_cache[expression_string]
+
+    def canonical_key(self, expression_string) -> tuple:
+        """
+        Normalized identity of an expression, for use as a cache key
+
+        Literals within each clause are merged into (pos, neg) mask ints and
+        clauses are sorted, so formulas differing only in clause order,
+        literal order or whitespace map to the same key
+
+        Args:
+            expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
+        Returns:
+            tuple: (variables tuple, sorted clause-mask tuple)
+        """
+        masks, variables = self._clause_masks(expression_string)
+        return tuple(variables), tuple(sorted(masks))
+
+    def _build_oracle_cached(self, expression_string) -> tuple:
+        """
+        Returns the oracle circuit for the expression, building it on first use
+
+        The cached circuit is shared between calls - callers must not mutate it
+        (use oracle_qc.copy() if mutation is needed)
+
+        Args:
+            expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
+        Returns:
+            tuple: (QuantumCircuit oracle, list of objective qubits)
+        """
+        key = self.canonical_key(expression_string)
+        if key not in self._oracle_cache:
+            _, variables = self.parse_expression(expression_string)
+            if len(variables) <= DIAGONAL_MAX_VARS:
+                oracle = self.build_diagonal_oracle(expression_string)
+            else:
+                cnf_expr, variables = self._cnf_of(expression_string)
+                oracle = self.build_oracle_circuit(cnf_expr, variables)
+            self._oracle_cache[key] = oracle
+        return self._oracle_cache[key]
+
+    def build_diagonal_oracle(self, expression_string) -> tuple:
+        """
+        Builds the oracle as a single diagonal gate from the truth table
+
+        The SAT oracle is just a diagonal of +/-1 phases, and for small
+        variable counts that diagonal is exactly the classical truth table
+        we can already compute. One diagonal gate replaces the whole clause
+        compute / phase-flip / uncompute cascade and needs no ancilla
+        qubits, so the statevector is 2^num_clauses times smaller too
+
+        Args:
+            expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
+        Returns:
+            tuple: (QuantumCircuit oracle, list of objective qubits)
+        """
+        sat, variables = self._sat_mask(expression_string)
+        num_vars = len(variables)
+
+        # DiagonalGate indexes basis states with qubit 0 as the least
+        # significant bit, matching the sat-mask convention
+        diag = np.where(sat, -1.0 + 0j, 1.0 + 0j)
+
+        qc = QuantumCircuit(num_vars)
+        qc.append(DiagonalGate(diag.tolist()), range(num_vars))
+
+        return qc, list(range(num_vars))
+
+    def _grover_circuit_cached(self, expression_string, iterations):
+        """
+        Returns the transpiled Grover circuit for the expression and iteration
+        count, building it on first use
+
+        Transpilation is a Python-side pass whose cost rivals the simulation
+        itself for small circuits, and the randomized search re-samples the
+        same iteration counts often, so the transpiled result is kept around
+
+        Args:
+            expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
+            iterations (int): number of Grover iterations
+        Returns:
+            QuantumCircuit: transpiled Grover circuit with measurements
+        """
+        key = (self.canonical_key(expression_string), iterations)
+        if key not in self._transpiled_cache:
+            oracle_qc, objective_qubits = self._build_oracle_cached(expression_string)
+            qc = self.construct_grover_circuit(oracle_qc, objective_qubits, iterations)
+            # canonicalize gates before Aer's fusion pass sees them
+            self._transpiled_cache[key] = transpile(
+                qc, self.simulator, optimization_level=3
+            )
+        return self._transpiled_cache[key]
+
+    def _clause_masks(self, expression_string) -> tuple:
+        """
+        Encodes the CNF form of the expression as integer bitmask pairs
+
+        Each clause becomes a (pos_mask, neg_mask) pair over variable indices,
+        where bit j of an assignment integer is the value of variables[j]. A
+        clause is satisfied iff (a & pos_mask) | (~a & neg_mask) is nonzero,
+        so SAT checking is a handful of int ops instead of sympy tree walks
+
+        Args:
+            expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
+        Returns:
+            tuple: (list of (pos_mask, neg_mask) tuples, list of variables)
+        """
+        cnf_expr, variables = self._cnf_of(expression_string)
+
+        if cnf_expr is true:  # tautology - no clauses to satisfy
+            return [], variables
+        if cnf_expr is false:  # contradiction - one unsatisfiable clause
+            return [(0, 0)], variables
+
+        clauses = cnf_expr.args if isinstance(cnf_expr, And) else [cnf_expr]
+        var_map = {name: j for j, name in enumerate(variables)}
+
+        masks = []
+        for clause in clauses:
+            literals = clause.args if isinstance(clause, Or) else [clause]
+            pos_mask = 0
+            neg_mask = 0
+            for lit in literals:
+                if isinstance(lit, Not):
+                    neg_mask |= 1 << var_map[str(lit.args[0])]
+                else:
+                    pos_mask |= 1 << var_map[str(lit)]
+            masks.append((pos_mask, neg_mask))
+
+        return masks, variables
+
+    def _optimal_iterations(self, num_solutions, N):
+        """
+        Optimal Grover iteration count for the given solution count
+
+        Args:
+            num_solutions (int): number (or estimate) of solutions M
+            N (int): size of the search space
+        Returns:
+            int or None: pi/(4*asin(sqrt(M/N))) rounded, or None when M is 0
+                or N (no amplification possible)
+        """
+        if not 0 < num_solutions < N:
+            return None
+        theta = math.asin(math.sqrt(num_solutions / N))
+        return max(1, round(math.pi / (4 * theta) - 0.5))
+
+    def get_histogram_data(self, expression_string, iterations=None, shots=1024) -> tuple:
+        """
+        Runs a fixed Grover circuit and returns the measurement distribution
+
+        Used by the UI's histogram view. The iteration count defaults to the
+        optimum for the estimated solution count, and results are cached so
+        repeated renders of the same expression don't re-simulate
+
+        Args:
+            expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
+            iterations (int): Grover iterations, or None for the estimated optimum
+            shots (int): shots for the simulation run
+        Returns:
+            tuple: (dict of bitstring (variables[0] first) -> probability,
+                most probable bitstring) - the argmax is tracked while the
+                counts are tallied, avoiding a second pass over the dict
+        """
+        if iterations is None:
+            _, variables = self.parse_expression(expression_string)
+            N = 2 ** len(variables)
+            iterations = self._optimal_iterations(
+                self.estimate_solution_count(expression_string), N
+            )
+            if iterations is None:
+                # the sampled estimate saw no (or only) solutions - sparse
+                # solution sets at large n look like this, so assume the
+                # single-solution optimum of ~pi/4*sqrt(N) iterations rather
+                # than running one uninformative iteration
+                iterations = max(1, round(math.pi / 4 * math.sqrt(N)))
+
+        key = (self.canonical_key(expression_string), iterations, shots)
+        if key not in self._histogram_cache:
+            _, variables = self.parse_expression(expression_string)
+            if len(variables) <= DIRECT_SIM_MAX_VARS:
+                # small circuit - the direct kernel avoids Aer's fixed
+                # per-run dispatch cost entirely
+                histogram, top_measurement = self._grover_distribution(
+                    expression_string, iterations, shots
+                )
+            else:
+                qc = self._grover_circuit_cached(expression_string, iterations)
+                counts = self.simulator.run(qc, shots=shots).result().get_counts()
+                # reverse measurements to match variable order, tracking the
+                # argmax in the same pass
+                histogram = {}
+                top_measurement = None
+                top_prob = -1.0
+                for meas, count in counts.items():
+                    prob = count / shots
+                    histogram[meas[::-1]] = prob
+                    if prob > top_prob:
+                        top_prob = prob
+                        top_measurement = meas[::-1]
+            self._histogram_cache[key] = (histogram, top_measurement)
+        return self._histogram_cache[key]
+
+    def _grover_distribution(self, expression_string, iterations, shots) -> tuple:
+        """
+        Samples the Grover output distribution from a direct simulation
+
+        The oracle is the truth-table phase flip and the diffuser a
+        reflection about the mean, so the whole run is a couple of
+        vectorized passes per iteration over a real-valued statevector -
+        no circuit, transpile or Aer dispatch involved
+
+        Args:
+            expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
+            iterations (int): number of Grover iterations
+            shots (int): number of samples to draw
+        Returns:
+            tuple: (dict of bitstring (variables[0] first) -> probability,
+                most probable bitstring)
+        """
+        sat, variables = self._sat_mask(expression_string)
+        num_vars = len(variables)
+
+        if HAVE_NUMBA:
+            with _JIT_LOCK:
+                state = _grover_statevector_jit(sat, iterations)
+        else:
+            N = sat.shape[0]
+            signs = np.where(sat, -1.0, 1.0)
+            state = np.full(N, 1.0 / math.sqrt(N))
+            for _ in range(iterations):
+                state *= signs  # oracle phase flip
+                state = 2.0 * state.mean() - state  # reflect about the mean
+
+        probs = state * state
+        sampled = np.random.multinomial(shots, probs / probs.sum())
+
+        histogram = {
+            "".join(str((a >> j) & 1) for j in range(num_vars)): count / shots
+            for a, count in enumerate(sampled.tolist())
+            if count
+        }
+        top = int(sampled.argmax())
+        top_measurement = "".join(str((top >> j) & 1) for j in range(num_vars))
+        return histogram, top_measurement
+
+    def estimate_solution_count(self, expression_string, samples=4096) -> int:
+        """
+        Estimates the number of satisfying assignments by random sampling
+
+        Evaluates the clause bitmasks on a random sample of assignments, so
+        the cost stays constant in the number of variables instead of the
+        2^n full sweep. Exact when the full space is no bigger than the
+        sample budget
+
+        Args:
+            expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
+            samples (int): number of random assignments to test
+        Returns:
+            int: estimated number of solutions
+        """
+        _, variables = self.parse_expression(expression_string)
+        N = 2 ** len(variables)
+
+        if N <= samples:  # exact - enumeration is cheaper than sampling
+            sat, _ = self._sat_mask(expression_string)
+            return int(np.count_nonzero(sat))
+
+        a = np.random.randint(0, N, size=samples, dtype=np.uint64)
+        sat, _ = self._sat_mask(expression_string, a)
+        return round(int(np.count_nonzero(sat)) * N / samples)
+
+    def _truth_table_lambdified(self, expr, variables, a=None):
+        """
+        Evaluates the expression over assignments via a lambdified NumPy function
+
+        lambdify compiles the sympy tree once into a function of boolean
+        arrays, so one vectorized call covers all assignments without
+        converting to CNF first - useful for inputs where to_cnf would blow
+        up exponentially
+
+        Args:
+            expr: sympy boolean expression
+            variables: list of variables
+            a: optional uint64 array of assignments to test; defaults to the
+                full 2^n range
+        Returns:
+            bool array: one entry per tested assignment, True iff it
+                satisfies the expression (bit j of an assignment = variables[j])
+        """
+        num_vars = len(variables)
+        if a is None:
+            a = np.arange(2**num_vars, dtype=np.uint64)
+        bits = [((a >> np.uint64(j)) & np.uint64(1)).astype(bool) for j in range(num_vars)]
+
+        f = lambdify([symbols(name) for name in variables], expr, modules="numpy")
+        sat = np.asarray(f(*bits), dtype=bool)
+
+        # constant expressions collapse to a scalar
+        return np.broadcast_to(sat, a.shape)
+
+    def _sat_mask(self, expression_string, a=None) -> tuple:
+        """
+        Evaluates the expression over the truth table
+
+        Args:
+            expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
+            a: optional uint64 array of assignments to test; defaults to the
+                full 2^n range
+        Returns:
+            tuple: (bool array with one entry per tested assignment, list of
+                variables) - bit j of an assignment = variables[j]
         """
         expr, variables = self.parse_expression(expression_string)
         num_vars = len(variables)
-        solutions = []
 
-        # check all possible assignments
-        for i in range(2**num_vars):
-            bin_str = format(i, f"0{num_vars}b")
-            assignment = {
-                variables[j]: int(bin_str[j]) for j in range(num_vars)
-            }  # {'x': 0, 'y': 1, ...}
+        if _is_cnf(expr) or expression_string in self._cnf_cache:
+            # check the assignments at once with vectorized bitops
+            masks, variables = self._clause_masks(expression_string)
+            pos = np.array([p for p, _ in masks], dtype=np.uint64)
+            neg = np.array([m for _, m in masks], dtype=np.uint64)
+
+            if a is None and HAVE_NUMBA and num_vars >= NUMBA_MIN_VARS:
+                # JIT-compiled sweep, parallelized across cores
+                with _JIT_LOCK:
+                    sat = _eval_truth_table_jit(2**num_vars, pos, neg)
+            else:
+                if a is None:
+                    a = np.arange(2**num_vars, dtype=np.uint64)
+                sat = np.all(((a[:, None] & pos) | (~a[:, None] & neg)) != 0, axis=1)
+        else:
+            # not in CNF (and not already converted for the oracle) - skip
+            # to_cnf, which can blow up, and evaluate the tree directly
+            sat = self._truth_table_lambdified(expr, variables, a)
 
-            if expr.subs(assignment):  # evaluate
-                solutions.append(bin_str)
+        return sat, variables
 
-        return solutions
+    def solve_classically(self, expression_string, max_solutions=None) -> list:
+        """
+        Classically solves the SAT problem by brute force
+
+        Args:
+            expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
+            max_solutions (int): optional cap - stop enumerating once this
+                many solutions are found, bounding time and memory for large
+                variable counts
+        Returns:
+            list: all satisfying assignments as binary strings
+        """
+        _, variables = self.parse_expression(expression_string)
+        num_vars = len(variables)
+        N = 2**num_vars
 
-    def solve_quantum(self, expression_string):
+        if max_solutions is None or N <= SWEEP_CHUNK:
+            sat, _ = self._sat_mask(expression_string)
+            sol_ints = np.flatnonzero(sat).tolist()
+            if max_solutions is not None:
+                sol_ints = sol_ints[:max_solutions]
+        else:
+            # sweep in blocks so memory stays bounded and the enumeration
+            # can stop as soon as the cap is reached
+            sol_ints = []
+            for start in range(0, N, SWEEP_CHUNK):
+                a = np.arange(start, min(start + SWEEP_CHUNK, N), dtype=np.uint64)
+                sat, _ = self._sat_mask(expression_string, a)
+                sol_ints.extend((np.flatnonzero(sat) + start).tolist())
+                if len(sol_ints) >= max_solutions:
+                    sol_ints = sol_ints[:max_solutions]
+                    break
+
+        # only the (short) list of solutions is formatted as strings
+        solutions = [
+            "".join(str((a >> j) & 1) for j in range(num_vars)) for a in sol_ints
+        ]
+
+        return sorted(solutions)
+
+    def solve_quantum(self, expression_string, shots=1024):
         """
         Solves the SAT problem using Grover's algorithm without knowing the number of solutions in advance
 
         Args:
             expression_string (str): boolean expression, e.g. "(A | ~B) & (B | C)"
+            shots (int): shots per simulation run - extra shots are much
+                cheaper than extra runs, so callers wanting more confidence
+                should raise this rather than calling repeatedly
         Returns:
             dict: a dictionary containing results and metadata
         """
-        expr, variables = self.parse_expression(expression_string)
+        masks, variables = self._clause_masks(expression_string)
         num_vars = len(variables)
         N = 2**num_vars
 
         try:
-            oracle_qc, objective_qubits = self.build_oracle_circuit(expr, variables)
+            self._build_oracle_cached(expression_string)
         except Exception as e:
             raise ValueError(f"Error creating Oracle: {e}")
 
+        # a cheap sampled estimate of the solution count lets the first
+        # attempt use the optimal iteration count directly, instead of
+        # requiring the exact count from a full 2^n classical sweep; the
+        # randomized schedule below still covers estimates that are off
+        optimal_iterations = self._optimal_iterations(
+            self.estimate_solution_count(expression_string), N
+        )
+
         # Implementing algorithm from "Tight bounds on quantum searching" https://arxiv.org/pdf/quant-ph/9605034
+        # 1. build the full randomized schedule up front: the estimated
+        # optimum first, then random iterations in [1, m] for growing m
         m = 1.0
         lam = 1.2  # scaling factor
         max_m = math.sqrt(N)  # upper limit
 
-        attempts = 0
-
+        iteration_schedule = []
+        if optimal_iterations is not None:
+            iteration_schedule.append(optimal_iterations)
         while m <= max_m:
-            attempts += 1
-            # 1. pick random iterations in [1, m]
-            iterations = random.randint(1, max(1, int(m)))
-
-            # 2. run grover
-            qc = self.construct_grover_circuit(oracle_qc, objective_qubits, iterations)
-            qc = transpile(qc, self.simulator)
-            job = self.simulator.run(qc, shots=1024)
-            result = job.result()
-            counts = result.get_counts()
-            top_measurement = max(counts, key=counts.get)
-
-            # 3. classically verify
-            assignment = {}
-            for i, name in enumerate(variables):
-                val = int(top_measurement[-(i + 1)])  # q_i is at -(i+1)
-                assignment[name] = val
-
-            if expr.subs(assignment):
-                # reverse measurements to match variable order
-                reversed_counts = {}
-                for meas, count in counts.items():
-                    reversed_meas = meas[::-1]
-                    reversed_counts[reversed_meas] = count
-
-                return {
-                    "solution": top_measurement[::-1],
-                    "iterations_used": iterations,
-                    "attempts": attempts,
-                    "counts": reversed_counts,
-                    "message": "Solution found using randomized Grover search.",
-                }
-
-            # 4. increase m
+            iteration_schedule.append(random.randint(1, max(1, int(m))))
             m = lam * m
 
+        # 2. run the schedule in waves of a few circuits per Aer job:
+        # experiments within a wave execute in parallel and share the fixed
+        # per-run setup cost, but verification happens between waves so the
+        # search stops as soon as an attempt succeeds - late schedule
+        # entries grow toward sqrt(N) iterations and are usually never run
+        attempts = 0
+        for start in range(0, len(iteration_schedule), SCHEDULE_WAVE):
+            wave = iteration_schedule[start : start + SCHEDULE_WAVE]
+            circuits = [
+                self._grover_circuit_cached(expression_string, iterations)
+                for iterations in wave
+            ]
+            result = self.simulator.run(circuits, shots=shots).result()
+
+            for idx, iterations in enumerate(wave):
+                attempts += 1
+                counts = result.get_counts(idx)
+                top_measurement = max(counts, key=counts.get)
+
+                # 3. classically verify against the clause bitmasks - clbit 0
+                # is the last character, so bit j of the int is variables[j]
+                a = int(top_measurement, 2)
+
+                if all((a & pos) | (~a & neg) for pos, neg in masks):
+                    # reverse measurements to match variable order
+                    reversed_counts = {}
+                    for meas, count in counts.items():
+                        reversed_meas = meas[::-1]
+                        reversed_counts[reversed_meas] = count
+
+                    return {
+                        "solution": top_measurement[::-1],
+                        "iterations_used": iterations,
+                        "attempts": attempts,
+                        "counts": reversed_counts,
+                        "message": "Solution found using randomized Grover search.",
+                    }
+
         return {
             "solution": None,
             "iterations_used": None,
@@ -130,18 +726,16 @@ class SatOracleBuilder:
             "message": "No solution found within search limits.",
         }
 
-    def build_oracle_circuit(self, expr, variables):
+    def build_oracle_circuit(self, cnf_expr, variables):
         """
-        Builds a quantum oracle circuit in CNF form for the given SAT expression
+        Builds a quantum oracle circuit for the given SAT expression in CNF
 
         Args:
-            expr: sympy boolean expression
+            cnf_expr: sympy boolean expression in CNF (AND of ORs), see _cnf_of
             variables: list of variables
         Returns:
             tuple: (QuantumCircuit oracle, list of objective qubits)
         """
-        cnf_expr = to_cnf(expr, simplify=True)  # AND of ORs
-
         if isinstance(cnf_expr, And):  # multiple clauses
             clauses = cnf_expr.args
         else:  # single clause
@@ -152,9 +746,11 @@ class SatOracleBuilder:
         qc = QuantumCircuit(num_vars + num_clauses)  # A, B, ... + ancillas (clauses)
         clause_qubits = list(range(num_vars, num_vars + num_clauses))
 
+        var_map = {name: i for i, name in enumerate(variables)}
+
         # compute all clauses
         for i, clause in enumerate(clauses):
-            self.apply_clause(clause, variables, clause_qubits[i], qc)
+            self.apply_clause(clause, var_map, clause_qubits[i], qc)
 
         # phase flip if all clauses are true - grover oracle
         if clause_qubits:
@@ -165,17 +761,17 @@ class SatOracleBuilder:
 
         # uncompute clauses (reverse order) for later amplitude amplification
         for i in range(len(clauses) - 1, -1, -1):
-            self.apply_clause(clauses[i], variables, clause_qubits[i], qc)
+            self.apply_clause(clauses[i], var_map, clause_qubits[i], qc)
 
         return qc, list(range(num_vars))
 
-    def apply_clause(self, clause, variables, target_qubit, qc):
+    def apply_clause(self, clause, var_map, target_qubit, qc):
         """
         Applies the clause logic to the target qubit, flipping it iff the clause is satisfied
 
         Args:
             clause: sympy clause (Or of literals / single literal)
-            variables: list of variables
+            var_map: dict mapping variable name to qubit index
             target_qubit: index of the target qubit to flip if the clause is satisfied
             qc: QuantumCircuit to apply the clause to
         """
@@ -185,30 +781,50 @@ class SatOracleBuilder:
             literals = [clause]
 
         qubits_to_check = []
-        x_gates_to_apply = []
+        ctrl_state = 0
 
-        var_map = {name: i for i, name in enumerate(variables)}
-
-        for lit in literals:
+        for k, lit in enumerate(literals):
             sym = lit if not isinstance(lit, Not) else lit.args[0]
-            idx = var_map[str(sym)]
-            qubits_to_check.append(idx)
-
-            if not isinstance(lit, Not):
-                x_gates_to_apply.append(idx)
-
-        # flip variables whre literal is positive
-        if x_gates_to_apply:
-            qc.x(x_gates_to_apply)
-
-        # at this point, all controls are 1 when every literal is false
-
-        # flip target if all literals are false
-        qc.mcx(qubits_to_check, target_qubit)
-
-        # unflip variables
-        if x_gates_to_apply:
-            qc.x(x_gates_to_apply)
+            qubits_to_check.append(var_map[str(sym)])
+
+            if isinstance(lit, Not):
+                ctrl_state |= 1 << k
+
+        num_controls = len(qubits_to_check)
+        involved = set(qubits_to_check) | {target_qubit}
+        # any other qubit can serve as a dirty ancilla - the decomposition
+        # restores its state, entangled or not
+        ancillas = [q for q in range(qc.num_qubits) if q not in involved]
+
+        if (
+            num_controls >= MCX_DIRTY_MIN_CONTROLS
+            and len(ancillas) >= num_controls - 2
+        ):
+            # wide clause: linear-CX decomposition borrowing idle qubits.
+            # The synthesized circuit only has plain 1-controls, so flip the
+            # positive-literal qubits around it
+            flips = [
+                qubits_to_check[k]
+                for k in range(num_controls)
+                if not (ctrl_state >> k) & 1
+            ]
+            if flips:
+                qc.x(flips)
+            qc.compose(
+                synth_mcx_n_dirty_i15(num_controls),
+                qubits_to_check + [target_qubit] + ancillas[: num_controls - 2],
+                inplace=True,
+            )
+            if flips:
+                qc.x(flips)
+        else:
+            # single open-controlled MCX: controls expect 0 for positive
+            # literals and 1 for negated ones, so the target flips iff every
+            # literal is false
+            qc.append(
+                MCXGate(num_controls, ctrl_state=ctrl_state),
+                qubits_to_check + [target_qubit],
+            )
 
         # flip target (so 1 means clause true)
         qc.x(target_qubit)
@@ -229,30 +845,43 @@ class SatOracleBuilder:
 
         qc.h(objective_qubits)
 
+        # convert once so each iteration appends a single reusable instruction
+        # instead of re-flattening the full gate list into the circuit
+        oracle_gate = oracle_qc.to_gate(label="oracle")
+        diffuser_gate = self.build_diffuser(len(objective_qubits)).to_gate(
+            label="diffuser"
+        )
+
         for _ in range(iterations):
-            qc.compose(oracle_qc, inplace=True)  # apply oracle
-            self.add_diffuser(qc, objective_qubits)
+            qc.append(oracle_gate, range(num_qubits))  # apply oracle
+            qc.append(diffuser_gate, objective_qubits)
 
         qc.measure(objective_qubits, range(len(objective_qubits)))
 
         return qc
 
-    def add_diffuser(self, qc, target_qubits):
+    def build_diffuser(self, num_qubits):
         """
-        Appends diffuser to the circuit on the target qubits
+        Builds the diffuser circuit on the given number of qubits
 
         Args:
-            qc: QuantumCircuit to append to
-            target_qubits: list of qubits to apply diffuser on
+            num_qubits: number of qubits to apply the diffuser on
+        Returns:
+            QuantumCircuit: the diffuser
         """
+        qc = QuantumCircuit(num_qubits)
+        target_qubits = list(range(num_qubits))
+
         qc.h(target_qubits)
         qc.x(target_qubits)
 
         # phase flip
-        if len(target_qubits) == 1:
-            qc.z(target_qubits[0])
+        if num_qubits == 1:
+            qc.z(0)
         else:
             qc.mcp(math.pi, target_qubits[:-1], target_qubits[-1])
 
         qc.x(target_qubits)
         qc.h(target_qubits)
+
+        return qc
@@ -1,13 +1,20 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+import anyio.to_thread
+import asyncio
+import os
 import uvicorn
 import traceback
+from functools import lru_cache
 
-from .logic import SatOracleBuilder
+from .logic import SatOracleBuilder, _BoundedCache
 
 
-app = FastAPI(root_path="/api")
+# orjson encodes the dict-of-float histogram payloads several times faster
+# than the stdlib json encoder, and handles numpy scalars natively
+app = FastAPI(root_path="/api", default_response_class=ORJSONResponse)
 
 # Allow CORS for frontend
 app.add_middleware(
@@ -20,34 +27,169 @@ app.add_middleware(
 
 solver = SatOracleBuilder()
 
+# bound on enumerated solutions per response - a wide satisfiable formula
+# can have millions, and materializing then JSON-encoding them dominates
+# the request long before the sweep itself does
+MAX_CLASSICAL_SOLUTIONS = 1024
+
+
+@app.on_event("startup")
+async def startup_event():
+    # the solver calls are CPU-bound, so size the worker pool to the core
+    # count rather than anyio's default of 40
+    anyio.to_thread.current_default_thread_limiter().total_tokens = os.cpu_count()
+
 
 class SatRequest(BaseModel):
     expression: str
+    unknown_solutions: bool = False
+    # set False for enumerate-only requests that don't need quantum output -
+    # they then return in the time of the classical solver alone
+    return_histogram: bool = True
+    # histograms grow as 2^n entries - only the k most probable buckets are
+    # returned, which is all the chart can usefully show anyway
+    top_k: int = 64
+
+
+# maps canonical keys back to a representative expression string, so the
+# memoized solver helper can be keyed on the canonical form alone; sized
+# well above the solve cache so a key is never evicted between the handler
+# registering it and the worker thread reading it back
+_expr_for_key = _BoundedCache(4096)
+
+# single-flight: concurrent requests for the same (expression, mode) share
+# one solver run instead of each spawning their own simulation
+_inflight = {}
+_inflight_lock = asyncio.Lock()
+
+
+@lru_cache(maxsize=1024)
+def _cached_solve(expr_key, unknown_solutions, return_histogram) -> dict:
+    """
+    Runs the solvers and memoizes the response payload
+
+    The payload is a pure function of the expression, so entries are never
+    invalidated; repeat requests cost a dict lookup instead of a simulation
+    """
+    expression = _expr_for_key[expr_key]
+
+    # classical validation - capped so the sweep stops early and the
+    # response stays bounded for expressions with huge solution sets
+    classical_solutions = solver.solve_classically(
+        expression, max_solutions=MAX_CLASSICAL_SOLUTIONS
+    )
+    if len(classical_solutions) == MAX_CLASSICAL_SOLUTIONS:
+        # the enumeration was truncated - report a sampled estimate of the
+        # true count rather than the cap. The estimate can round to 0 for
+        # sparse solution sets, so never report fewer than were actually
+        # enumerated
+        num_solutions = max(
+            solver.estimate_solution_count(expression), len(classical_solutions)
+        )
+    else:
+        num_solutions = len(classical_solutions)
+
+    if unknown_solutions:
+        # randomized Grover search that does not assume the solution count;
+        # it retries internally with a growing iteration schedule, so one
+        # call with a larger shot budget beats repeated calls
+        result = solver.solve_quantum(expression, shots=3072)
+        histogram = result["counts"]
+        top_measurement = result["solution"]
+    elif not return_histogram:
+        # enumerate-only request - skip the simulator entirely
+        histogram = None
+        top_measurement = None
+    else:
+        num_vars = len(solver.parse_expression(expression)[1])
+        if not classical_solutions:
+            # unsatisfiable (the enumeration is exhaustive when it finds
+            # nothing) - there is nothing to amplify, so skip the simulator
+            # instead of returning meaningless noise
+            histogram = {}
+            top_measurement = None
+        elif num_solutions == (1 << num_vars):
+            # tautology - the Grover distribution is exactly uniform, so
+            # synthesize it analytically. Only a bounded prefix of buckets
+            # is materialized: every bucket has the same probability,
+            # responses are top_k-truncated anyway, and the full space can
+            # run to millions of entries
+            buckets = min(1 << num_vars, MAX_CLASSICAL_SOLUTIONS)
+            histogram = {
+                format(i, f"0{num_vars}b"): 1.0 / (1 << num_vars)
+                for i in range(buckets)
+            }
+            top_measurement = classical_solutions[0]
+        elif len(classical_solutions) < MAX_CLASSICAL_SOLUTIONS:
+            # the enumeration completed, so num_solutions is exact - pass
+            # the optimal iteration count instead of letting the solver
+            # re-estimate it by sampling, which misses sparse solution
+            # sets at large n and then amplifies nothing
+            histogram, top_measurement = solver.get_histogram_data(
+                expression,
+                iterations=solver._optimal_iterations(num_solutions, 1 << num_vars),
+            )
+        else:
+            histogram, top_measurement = solver.get_histogram_data(expression)
+
+    return {
+        "classical_solutions": classical_solutions,
+        "num_solutions": num_solutions,
+        "counts": histogram,
+        "top_measurement": top_measurement,
+    }
 
 
 @app.post("/solve")
-def solve_sat(request: SatRequest):
+async def solve_sat(request: SatRequest):
     try:
         print(f"Received request: {request.expression}")
 
-        # classical validation
-        classical_solutions = solver.solve_classically(request.expression)
-        num_solutions = len(classical_solutions)
-
-        # quantum solving - we are not guaranteed to find a solution on
-        # first try, so run up to 3 times if needed
-        max_attempts = 3
-        for _ in range(max_attempts):
-            result = solver.solve_quantum(request.expression)
-            if result["solution"]:
-                break
-
-        result_data = {
-            "classical_solutions": classical_solutions,
-            "num_solutions": num_solutions,
-            "counts": result.get("counts"),
-            "top_measurement": result["solution"],
-        }
+        # solver calls are blocking and CPU-heavy - run them on the worker
+        # thread pool so the event loop stays free for concurrent requests
+        expr_key = await anyio.to_thread.run_sync(
+            solver.canonical_key, request.expression
+        )
+        # plain assignment, not setdefault - _BoundedCache enforces its cap
+        # (and locks eviction) in __setitem__, which setdefault bypasses
+        if expr_key not in _expr_for_key:
+            _expr_for_key[expr_key] = request.expression
+
+        flight_key = (expr_key, request.unknown_solutions, request.return_histogram)
+        async with _inflight_lock:
+            future = _inflight.get(flight_key)
+            is_owner = future is None
+            if is_owner:
+                future = asyncio.get_running_loop().create_future()
+                _inflight[flight_key] = future
+
+        if is_owner:
+            try:
+                result_data = await anyio.to_thread.run_sync(
+                    _cached_solve,
+                    expr_key,
+                    request.unknown_solutions,
+                    request.return_histogram,
+                )
+                future.set_result(result_data)
+            except BaseException as e:
+                future.set_exception(e)
+                future.exception()  # mark retrieved in case nobody is waiting
+                raise
+            finally:
+                async with _inflight_lock:
+                    _inflight.pop(flight_key, None)
+        else:
+            # an identical request is already running - share its result
+            result_data = await future
+
+        counts = result_data["counts"]
+        if counts and len(counts) > request.top_k:
+            # truncate per-request (the cache holds the full histogram) -
+            # JSON-encoding tens of thousands of near-zero buckets dominates
+            # response time for wide formulas
+            top_buckets = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)
+            result_data = {**result_data, "counts": dict(top_buckets[: request.top_k])}
 
         return result_data
 
@@ -56,5 +198,14 @@ def solve_sat(request: SatRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# single-process dev server only - production runs one gunicorn worker per
+# core via the Procfile, since a lone process can't scale this CPU-bound
+# workload past one core
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    try:
+        import uvloop  # noqa: F401 - not installed on Windows
+
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop=loop, http="httptools")
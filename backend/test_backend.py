@@ -0,0 +1,39 @@
+import pytest
+
+from backend.logic import SatOracleBuilder
+
+
+@pytest.fixture(scope="module")
+def solver():
+    # one builder for the whole module - its constructor pulls in Qiskit
+    # and boots the Aer simulator, which dominates per-test time otherwise
+    return SatOracleBuilder()
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        ("A & B", ["11"]),
+        ("A & ~A", []),
+        ("(A|B)&(~A|C)&(~B|D)", ["0101", "0111", "1010", "1011", "1111"]),
+    ],
+)
+def test_classical(solver, expr, expected):
+    assert solver.solve_classically(expr) == sorted(expected)
+
+
+@pytest.mark.parametrize("expr", ["A & B", "(A|B)&(~A|C)&(~B|D)"])
+def test_histogram_top_is_a_solution(solver, expr):
+    histogram, top_measurement = solver.get_histogram_data(expr)
+    assert top_measurement in solver.solve_classically(expr)
+    assert abs(sum(histogram.values()) - 1.0) < 1e-9
+
+
+def test_unknown_solution_count(solver):
+    result = solver.solve_quantum("(A | ~B) & (B | C) & ~A")
+    assert result["solution"] == "001"
+
+
+def test_invalid_expression(solver):
+    with pytest.raises(Exception):
+        solver.solve_classically("((")